@@ -0,0 +1,111 @@
+# benchmark.py
+"""
+Compare the vector store backends on synthetic, pre-embedded data.
+
+    python -u benchmark.py --points 200000 --queries 200
+
+The Qdrant server backend is only measured when a server answers at QDRANT_SERVER_CONFIG.
+"""
+import argparse
+import tempfile
+import time
+from typing import List, Dict, Any
+
+import numpy as np
+
+from src.config import REGIONES
+from src.vector_backends import (
+    VectorBackend,
+    QdrantLocalBackend,
+    QdrantServerBackend,
+    NumpyMmapBackend,
+)
+
+BENCH_COLLECTION = "benchmark_docs"
+# Qdrant requests are batched; the numpy backend takes the dataset in one upsert,
+# i.e. one segment per ingestion run, as in normal use
+QDRANT_BATCH_SIZE = 10000
+
+
+def make_dataset(points: int, dim: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((points, dim), dtype=np.float32)
+    regions = REGIONES or [f"region_{i}" for i in range(16)]
+    payloads = [
+        {
+            "text": f"chunk {i}",
+            "source": f"doc_{i // 50}.pdf",
+            "page": i % 50,
+            "region": regions[i % len(regions)],
+        }
+        for i in range(points)
+    ]
+    return vectors, payloads, regions
+
+
+def bench(backend: VectorBackend, vectors: np.ndarray, payloads: List[Dict[str, Any]],
+          queries: np.ndarray, region: str, k: int, batch_size: int) -> Dict[str, Any]:
+    backend.ensure_collection(vectors.shape[1])
+
+    start = time.perf_counter()
+    for i in range(0, len(payloads), batch_size):
+        backend.upsert(vectors[i:i + batch_size].tolist(), payloads[i:i + batch_size])
+    insert_s = time.perf_counter() - start
+
+    query_lists = queries.tolist()
+    backend.search(query_lists[0], k=k)  # warm-up (page cache, lazy loading)
+
+    start = time.perf_counter()
+    for q in query_lists:
+        backend.search(q, k=k)
+    search_ms = (time.perf_counter() - start) / len(query_lists) * 1000
+
+    start = time.perf_counter()
+    for q in query_lists:
+        backend.search(q, k=k, filters={"region": region})
+    filtered_ms = (time.perf_counter() - start) / len(query_lists) * 1000
+
+    segments = backend.stats().get("segments", "-")
+    backend.delete()
+    backend.close()
+    return {"insert_s": insert_s, "search_ms": search_ms, "filtered_ms": filtered_ms, "segments": segments}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=3)
+    args = parser.parse_args()
+
+    vectors, payloads, regions = make_dataset(args.points, args.dim)
+    queries = np.random.default_rng(1).standard_normal((args.queries, args.dim), dtype=np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            "qdrant_local": (lambda: QdrantLocalBackend(BENCH_COLLECTION, path=f"{tmp}/qdrant"), QDRANT_BATCH_SIZE),
+            "numpy_float16": (
+                lambda: NumpyMmapBackend(BENCH_COLLECTION, root=f"{tmp}/numpy16", dtype="float16"), args.points
+            ),
+            "numpy_float32": (
+                lambda: NumpyMmapBackend(BENCH_COLLECTION, root=f"{tmp}/numpy32", dtype="float32"), args.points
+            ),
+            "qdrant_server": (lambda: QdrantServerBackend(BENCH_COLLECTION), QDRANT_BATCH_SIZE),
+        }
+
+        print(f"{'backend':<16}{'insert (s)':>12}{'search (ms)':>14}{'filtered (ms)':>16}{'segments':>10}")
+        for name, (factory, batch_size) in backends.items():
+            try:
+                result = bench(factory(), vectors, payloads, queries, regions[0], args.k, batch_size)
+            except Exception as e:
+                print(f"{name:<16}skipped: {str(e).splitlines()[0]}")
+                continue
+            print(
+                f"{name:<16}{result['insert_s']:>12.2f}{result['search_ms']:>14.2f}"
+                f"{result['filtered_ms']:>16.2f}{result['segments']:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
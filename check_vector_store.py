@@ -0,0 +1,232 @@
+# check_vector_store.py
+"""
+Checks for the numpy backend's single-writer / many-readers contract.
+
+    python -u check_vector_store.py
+
+Runs writers and read_only readers (in this and in child processes) against a temp root.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+
+from src.vector_backends import NumpyMmapBackend, _MmapSegment
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_child(code: str) -> subprocess.CompletedProcess:
+    """Run `code` in a separate Python process with the repo importable."""
+    prelude = f"import sys; sys.path.insert(0, {BASE_DIR!r})\n"
+    return subprocess.run(
+        [sys.executable, "-c", prelude + textwrap.dedent(code)],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+def texts(hits):
+    return [payload["text"] for _, payload in hits]
+
+
+def check_reader_picks_up_new_segments(root: str):
+    writer = NumpyMmapBackend("refresh", root=root)
+    reader = NumpyMmapBackend("refresh", root=root, read_only=True)
+    assert reader.search([1, 0], k=1) == []
+
+    writer.upsert([[1, 0]], [{"text": "a", "region": "R1"}])
+    assert texts(reader.search([1, 0], k=1)) == ["a"]
+
+    writer.upsert([[0, 1]], [{"text": "b", "region": "R2"}])
+    assert texts(reader.search([0, 1], k=1)) == ["b"]
+    assert texts(reader.search([1, 0], k=5, filters={"region": "R2"})) == ["b"]
+    assert reader.stats()["points_count"] == 2
+
+    child = run_child(f"""
+        from src.vector_backends import NumpyMmapBackend
+        reader = NumpyMmapBackend("refresh", root={root!r}, read_only=True)
+        print(reader.stats()["points_count"])
+    """)
+    assert child.stdout.strip() == "2", child.stderr
+
+
+def check_delete_and_recreate(root: str):
+    writer = NumpyMmapBackend("recreate", root=root)
+    reader = NumpyMmapBackend("recreate", root=root, read_only=True)
+
+    writer.upsert([[1, 0], [0, 1]], [{"text": "a"}, {"text": "b"}])
+    assert sorted(texts(reader.search([1, 0], k=2))) == ["a", "b"]
+
+    # the reader does not poll while the collection is gone
+    assert writer.delete()
+    writer.upsert([[1, 0]], [{"text": "NEW"}])
+
+    assert texts(reader.search([1, 0], k=5)) == ["NEW"]
+    assert reader.stats()["points_count"] == 1
+
+
+def check_search_during_refresh(root: str):
+    writer = NumpyMmapBackend("interleave", root=root)
+    reader = NumpyMmapBackend("interleave", root=root, read_only=True)
+    writer.upsert([[1, 0]], [{"text": "a"}])
+    writer.upsert([[0, 1]], [{"text": "b"}])
+
+    # another thread refreshes the reader onto a recreated collection mid-search
+    search_scores = _MmapSegment.scores
+
+    def scores_then_recreate(segment, query, rows=None):
+        _MmapSegment.scores = search_scores
+        writer.delete()
+        writer.upsert([[1, 0]], [{"text": "NEW"}])
+        reader.stats()
+        return search_scores(segment, query, rows)
+
+    _MmapSegment.scores = scores_then_recreate
+    try:
+        assert sorted(texts(reader.search([1, 1], k=5))) == ["a", "b"]
+    finally:
+        _MmapSegment.scores = search_scores
+    assert texts(reader.search([1, 1], k=5)) == ["NEW"]
+
+
+def check_rejected_batches(root: str):
+    writer = NumpyMmapBackend("batches", root=root)
+    assert writer.upsert([], []) == 0
+    writer.upsert([[1, 0]], [{"text": "a"}])
+    assert writer.upsert([], []) == 0
+    try:
+        writer.upsert([[1, 0, 0]], [{"text": "wide"}])
+        raise AssertionError("wrong-width vectors were accepted")
+    except ValueError:
+        pass
+
+    try:
+        writer.upsert([[0, 1]], [{"text": "a", "page": object()}])  # payload json can't encode
+        raise AssertionError("unserializable payload was accepted")
+    except TypeError:
+        pass
+    assert len(os.listdir(os.path.join(root, "batches", "segments"))) == 1
+
+    reader = NumpyMmapBackend("batches", root=root, read_only=True)
+    assert texts(reader.search([1, 0], k=5)) == ["a"]
+    assert reader.stats()["segments"] == 1
+
+
+def check_crashed_writer(root: str):
+    child = run_child(f"""
+        import os
+        from src.vector_backends import NumpyMmapBackend
+        writer = NumpyMmapBackend("crash", root={root!r})
+        writer.upsert([[1, 0]], [{{"text": "a"}}])
+        writer._publish = lambda manifest: os._exit(1)  # die after the rename, before publishing
+        writer.upsert([[0, 1]], [{{"text": "ORPHAN"}}])
+    """)
+    assert child.returncode == 1, child.stderr
+    segments_dir = os.path.join(root, "crash", "segments")
+    assert len(os.listdir(segments_dir)) == 2
+
+    writer = NumpyMmapBackend("crash", root=root)
+    writer.upsert([[0, 1]], [{"text": "b"}])
+    reader = NumpyMmapBackend("crash", root=root, read_only=True)
+    assert sorted(texts(reader.search([1, 1], k=5))) == ["a", "b"]
+    assert len(os.listdir(segments_dir)) == 2
+
+
+def check_unreadable_segment(root: str):
+    child = run_child(f"""
+        from src.vector_backends import NumpyMmapBackend
+        writer = NumpyMmapBackend("corrupt", root={root!r})
+        writer.upsert([[1, 0]], [{{"text": "a"}}])
+        writer.upsert([[0, 1]], [{{"text": "b"}}])
+    """)
+    assert child.returncode == 0, child.stderr
+    segments_dir = os.path.join(root, "corrupt", "segments")
+    first = sorted(os.listdir(segments_dir))[0]
+    # what a power loss can leave behind: the manifest made it to disk, a segment file did not
+    open(os.path.join(segments_dir, first, "meta.json"), "w").close()
+
+    writer = NumpyMmapBackend("corrupt", root=root)
+    try:
+        writer.upsert([[1, 1]], [{"text": "c"}])
+        raise AssertionError("writer recreated a collection it could not open")
+    except RuntimeError:
+        pass
+    assert len(os.listdir(segments_dir)) == 2
+    with open(os.path.join(root, "corrupt", "manifest.json"), encoding="utf-8") as f:
+        assert len(json.load(f)["segments"]) == 2
+
+    assert writer.delete()
+
+
+def check_single_writer_process(root: str):
+    first = NumpyMmapBackend("writers", root=root)
+    second = NumpyMmapBackend("writers", root=root)
+    first.upsert([[1, 0]], [{"text": "a"}])
+    second.upsert([[0, 1]], [{"text": "b"}])
+    assert NumpyMmapBackend("writers", root=root, read_only=True).stats()["points_count"] == 2
+
+    child = run_child(f"""
+        from src.vector_backends import NumpyMmapBackend
+        try:
+            NumpyMmapBackend("writers", root={root!r}).upsert([[1, 1]], [{{"text": "c"}}])
+        except RuntimeError:
+            print("refused")
+    """)
+    assert child.stdout.strip() == "refused", child.stderr
+
+    reader = NumpyMmapBackend("writers", root=root, read_only=True)
+    try:
+        reader.upsert([[1, 1]], [{"text": "c"}])
+        raise AssertionError("read-only backend accepted a write")
+    except PermissionError:
+        pass
+
+
+def check_close_releases_writer(root: str):
+    first = NumpyMmapBackend("handover", root=root)
+    second = NumpyMmapBackend("handover", root=root)
+    first.upsert([[1, 0]], [{"text": "a"}])
+    second.upsert([[0, 1]], [{"text": "b"}])
+
+    child_code = f"""
+        from src.vector_backends import NumpyMmapBackend
+        try:
+            NumpyMmapBackend("handover", root={root!r}).upsert([[1, 1]], [{{"text": "c"}}])
+            print("wrote")
+        except RuntimeError:
+            print("refused")
+    """
+    first.close()
+    assert run_child(child_code).stdout.strip() == "refused"  # second still holds it
+    second.close()
+    assert run_child(child_code).stdout.strip() == "wrote"
+
+    # a closed writer takes the lock again on its next write
+    first.upsert([[1, 0]], [{"text": "d"}])
+    assert NumpyMmapBackend("handover", root=root, read_only=True).stats()["points_count"] == 4
+    first.close()
+
+
+def main():
+    checks = [
+        check_reader_picks_up_new_segments,
+        check_delete_and_recreate,
+        check_search_during_refresh,
+        check_rejected_batches,
+        check_crashed_writer,
+        check_unreadable_segment,
+        check_single_writer_process,
+        check_close_releases_writer,
+    ]
+    with tempfile.TemporaryDirectory() as root:
+        for check in checks:
+            check(root)
+            print(f"ok  {check.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -60,6 +60,25 @@ EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 COLLECTION_NAME = "chinchilla_docs"
 METADATA_FIELDS = ["source", "page", "region"]
 
+# vector store backend: "qdrant_local", "qdrant_server" or "numpy"
+VECTOR_BACKEND = "qdrant_local"
+
+# qdrant server mode (gRPC), used when VECTOR_BACKEND == "qdrant_server"
+QDRANT_SERVER_CONFIG = {
+    "host": "localhost",
+    "port": 6333,
+    "grpc_port": 6334,
+    "prefer_grpc": True,
+    "timeout": 30
+}
+
+# memory-mapped numpy exact search, used when VECTOR_BACKEND == "numpy"
+NUMPY_STORE_PATH = os.path.join(BASE_DIR, "data", "numpy_store")
+# float32 searches with one BLAS matmul; "float16" halves memory and disk
+# but every query up-casts the matrix blockwise (several times slower)
+NUMPY_STORE_DTYPE = "float32"
+FILTER_FIELDS = ["region", "comuna"]
+
 # test query
 TARGET_QUESTION = "¿En qué proyectos fue relevante la chinchilla chinchilla?"
 
@@ -20,7 +20,7 @@ class RAGAgent:
 
     def __init__(self):
         dp = DocumentProcessor(DOCS_DIR)  
-        self.vector_store = VectorStore(dp.embeddings)
+        self.vector_store = VectorStore(dp.embeddings, read_only=True)
         self.llm = LlamaCpp(model_path=MODEL_PATH, **MODEL_CONFIG)
 
     def _build_prompt(self, context: str, question: str) -> str:
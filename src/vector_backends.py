@@ -0,0 +1,726 @@
+# src/vector_backends.py
+import os
+import json
+import uuid
+import shutil
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    Distance,
+    VectorParams,
+    PointStruct,
+    Filter,
+    FieldCondition,
+    MatchValue,
+)
+
+from src.config import (
+    VECTOR_DB_PATH,
+    COLLECTION_NAME,
+    VECTOR_BACKEND,
+    QDRANT_SERVER_CONFIG,
+    NUMPY_STORE_PATH,
+    NUMPY_STORE_DTYPE,
+    FILTER_FIELDS,
+)
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# (score, payload) pairs returned by VectorBackend.search
+SearchHit = Tuple[float, Dict[str, Any]]
+
+
+class VectorBackend(ABC):
+    """
+    Storage/search interface targeted by VectorStore.
+    Backends receive ready-made embeddings; embedding the text is VectorStore's job.
+    """
+
+    name = "base"
+    collection_name: str
+
+    @abstractmethod
+    def ensure_collection(self, vector_size: int) -> None:
+        """Ensure the collection exists with the given vector size."""
+
+    @abstractmethod
+    def upsert(self, vectors: List[List[float]], payloads: List[Dict[str, Any]]) -> int:
+        """Insert vectors with their payloads. Returns the number of stored points."""
+
+    @abstractmethod
+    def search(
+        self,
+        query_vector: List[float],
+        k: int,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchHit]:
+        """Return the top-k (score, payload) pairs by cosine similarity, best first."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Return basic statistics about the collection."""
+
+    @abstractmethod
+    def delete(self) -> bool:
+        """Completely delete the collection."""
+
+    def close(self) -> None:
+        """Release locks and handles held by this backend. The default holds none."""
+
+
+class QdrantBackend(VectorBackend):
+    """
+    Qdrant backend, shared by the embedded (local path) and server modes.
+    """
+
+    name = "qdrant"
+
+    def __init__(self, client: QdrantClient, collection_name: str = COLLECTION_NAME):
+        self.client = client
+        self.collection_name = collection_name
+
+    def ensure_collection(self, vector_size: int) -> None:
+        try:
+            self.client.get_collection(self.collection_name)
+            logger.info(f"Collection {self.collection_name} already exists.")
+        except Exception:
+            logger.info(f"Creating collection {self.collection_name} with vector_size={vector_size}")
+            self.client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+            )
+
+    def upsert(self, vectors: List[List[float]], payloads: List[Dict[str, Any]]) -> int:
+        points = [
+            PointStruct(id=str(uuid.uuid4()), vector=list(vector), payload=payload)
+            for vector, payload in zip(vectors, payloads)
+        ]
+        self.client.upsert(collection_name=self.collection_name, points=points)
+        return len(points)
+
+    def search(
+        self,
+        query_vector: List[float],
+        k: int,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchHit]:
+        # models.Filter rather than a raw dict so the filter also survives the gRPC conversion
+        query_filter = None
+        if filters:
+            query_filter = Filter(
+                must=[
+                    FieldCondition(key=key, match=MatchValue(value=value))
+                    for key, value in filters.items()
+                ]
+            )
+
+        result = self.client.search(
+            collection_name=self.collection_name,
+            query_vector=list(query_vector),
+            limit=k,
+            query_filter=query_filter,
+            with_payload=True,
+            with_vectors=False,
+        )
+        return [(hit.score, hit.payload or {}) for hit in result]
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            info = self.client.get_collection(self.collection_name)
+            return {
+                "exists": True,
+                "backend": self.name,
+                "points_count": info.points_count,
+                "vector_size": info.config.params.vectors.size,
+                "distance": info.config.params.vectors.distance.value,
+            }
+        except Exception as e:
+            return {"exists": False, "backend": self.name, "error": str(e)}
+
+    def delete(self) -> bool:
+        try:
+            self.client.delete_collection(self.collection_name)
+            logger.info(f"Collection {self.collection_name} deleted.")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting collection: {str(e)}")
+            return False
+
+
+class QdrantLocalBackend(QdrantBackend):
+    """
+    Embedded Qdrant stored under VECTOR_DB_PATH (holds an exclusive per-process lock).
+    """
+
+    name = "qdrant_local"
+
+    def __init__(self, collection_name: str = COLLECTION_NAME, path: str = VECTOR_DB_PATH, read_only: bool = False):
+        if read_only:
+            logger.info("Embedded Qdrant cannot share its store between processes; "
+                        "use the numpy backend for concurrent readers.")
+        super().__init__(QdrantClient(path=path), collection_name)
+
+    def close(self) -> None:
+        # frees the embedded store's lock for other processes; the backend is unusable afterwards
+        self.client.close()
+
+
+# one client per server address, shared by every backend in the process;
+# the gRPC channel multiplexes concurrent requests
+_SERVER_CLIENTS: Dict[Tuple[Any, ...], QdrantClient] = {}
+_SERVER_CLIENTS_LOCK = threading.Lock()
+
+
+def _pooled_server_client(config: Dict[str, Any]) -> QdrantClient:
+    key = tuple(sorted(config.items()))
+    with _SERVER_CLIENTS_LOCK:
+        client = _SERVER_CLIENTS.get(key)
+        if client is None:
+            logger.info(f"Connecting to Qdrant server at {config.get('host')}:{config.get('grpc_port')}")
+            client = QdrantClient(**config)
+            _SERVER_CLIENTS[key] = client
+        return client
+
+
+class QdrantServerBackend(QdrantBackend):
+    """
+    Qdrant running as a separate server, reached over gRPC with a pooled client.
+    """
+
+    name = "qdrant_server"
+
+    def __init__(
+        self,
+        collection_name: str = COLLECTION_NAME,
+        config: Optional[Dict[str, Any]] = None,
+        read_only: bool = False,
+    ):
+        # the server arbitrates concurrent access itself, so read_only needs no special handling
+        super().__init__(_pooled_server_client(config or QDRANT_SERVER_CONFIG), collection_name)
+
+
+class _MmapSegment:
+    """
+    Read-only view over one immutable segment directory:
+
+        meta.json           count, dim, dtype, payload fields
+        vectors.npy         (count, dim) L2-normalized matrix
+        text.bin            utf-8 page contents, concatenated
+        text_offsets.npy    (count + 1,) byte offsets into text.bin
+        col_<i>.npy/.json   dictionary-encoded payload column (codes, values)
+        bitmap_<i>.npy      packed row bitmaps, one per value of a filter field
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        self.path = path
+        self.count: int = meta["count"]
+        self.dim: int = meta["dim"]
+        self.fields: List[str] = meta["fields"]
+        self.filter_fields: List[str] = meta["filter_fields"]
+
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self.text_offsets = np.load(os.path.join(path, "text_offsets.npy"), mmap_mode="r")
+        text_path = os.path.join(path, "text.bin")
+        if os.path.getsize(text_path):
+            self.text = np.memmap(text_path, dtype=np.uint8, mode="r")
+        else:
+            self.text = np.zeros(0, dtype=np.uint8)
+
+        self.codes: Dict[str, np.ndarray] = {}
+        self.values: Dict[str, List[Any]] = {}
+        self.lookup: Dict[str, Dict[str, int]] = {}
+        self.bitmaps: Dict[str, np.ndarray] = {}
+        for i, field in enumerate(self.fields):
+            self.codes[field] = np.load(os.path.join(path, f"col_{i}.npy"), mmap_mode="r")
+            with open(os.path.join(path, f"col_{i}.json"), "r", encoding="utf-8") as f:
+                self.values[field] = json.load(f)
+            self.lookup[field] = {_value_key(v): c for c, v in enumerate(self.values[field])}
+            if field in self.filter_fields:
+                self.bitmaps[field] = np.load(os.path.join(path, f"bitmap_{i}.npy"), mmap_mode="r")
+
+    def filter_rows(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Row indices matching every filter, or None when there is nothing to filter."""
+        if not filters:
+            return None
+
+        mask = np.ones(self.count, dtype=bool)
+        for field, value in filters.items():
+            code = self.lookup.get(field, {}).get(_value_key(value))
+            if code is None:
+                return np.zeros(0, dtype=np.int64)
+            if field in self.bitmaps:
+                mask &= np.unpackbits(self.bitmaps[field][code], count=self.count).astype(bool)
+            else:
+                mask &= np.asarray(self.codes[field]) == code
+        return np.flatnonzero(mask)
+
+    def scores(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine scores of the (normalized) query against all rows, or against `rows`."""
+        matrix = self.vectors if rows is None else self.vectors[rows]
+        return _matmul(matrix, query)
+
+    def payload(self, row: int) -> Dict[str, Any]:
+        start, end = int(self.text_offsets[row]), int(self.text_offsets[row + 1])
+        payload: Dict[str, Any] = {"text": bytes(self.text[start:end]).decode("utf-8")}
+        for field in self.fields:
+            code = int(self.codes[field][row])
+            if code >= 0:
+                payload[field] = self.values[field][code]
+        return payload
+
+
+# rows per block when up-casting non-float32 matrices (numpy has no BLAS path for float16)
+_MATMUL_BLOCK_ROWS = 65536
+
+
+def _matmul(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    if matrix.dtype == np.float32:
+        return matrix @ query
+    scores = np.empty(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], _MATMUL_BLOCK_ROWS):
+        end = start + _MATMUL_BLOCK_ROWS
+        scores[start:end] = matrix[start:end].astype(np.float32) @ query
+    return scores
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _value_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False)
+
+
+def _fsync_dir(path: str) -> None:
+    """Persist a directory's entries (renames, new files); a no-op where directories can't be opened."""
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _save_npy(path: str, array: np.ndarray) -> None:
+    with open(path, "wb") as f:
+        np.save(f, array)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _save_json(path: str, obj: Any) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _write_segment(
+    path: str,
+    vectors: np.ndarray,
+    payloads: List[Dict[str, Any]],
+    filter_fields: List[str],
+) -> None:
+    """Write normalized vectors and their payloads as a segment directory at `path`, synced to disk."""
+    os.makedirs(path)
+    count, dim = vectors.shape
+
+    _save_npy(os.path.join(path, "vectors.npy"), vectors)
+
+    texts = [str(p.get("text", "")).encode("utf-8") for p in payloads]
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(t) for t in texts])
+    with open(os.path.join(path, "text.bin"), "wb") as f:
+        for t in texts:
+            f.write(t)
+        f.flush()
+        os.fsync(f.fileno())
+    _save_npy(os.path.join(path, "text_offsets.npy"), offsets)
+
+    fields = sorted({key for p in payloads for key in p if key != "text"})
+    for i, field in enumerate(fields):
+        values: List[Any] = []
+        lookup: Dict[str, int] = {}
+        codes = np.full(count, -1, dtype=np.int32)
+        for row, p in enumerate(payloads):
+            if field not in p:
+                continue
+            key = _value_key(p[field])
+            if key not in lookup:
+                lookup[key] = len(values)
+                values.append(p[field])
+            codes[row] = lookup[key]
+
+        _save_npy(os.path.join(path, f"col_{i}.npy"), codes)
+        _save_json(os.path.join(path, f"col_{i}.json"), values)
+
+        if field in filter_fields:
+            bitmaps = np.stack([np.packbits(codes == c) for c in range(len(values))]) if values else \
+                np.zeros((0, (count + 7) // 8), dtype=np.uint8)
+            _save_npy(os.path.join(path, f"bitmap_{i}.npy"), bitmaps)
+
+    _save_json(
+        os.path.join(path, "meta.json"),
+        {
+            "count": count,
+            "dim": dim,
+            "dtype": vectors.dtype.name,
+            "fields": fields,
+            "filter_fields": [f for f in fields if f in filter_fields],
+        },
+    )
+    _fsync_dir(path)
+
+
+def _acquire_file_lock(path: str):
+    """Take a non-blocking exclusive lock on `path`; the lock lives as long as the returned file."""
+    handle = open(path, "a+")
+    try:
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        raise RuntimeError(f"Another process already holds the writer lock {path}")
+    return handle
+
+
+class _WriterLock:
+    """A collection's file lock plus the RLock that serializes writers within the process."""
+
+    def __init__(self, path: str):
+        self.handle = _acquire_file_lock(path)
+        self.lock = threading.RLock()
+        self.users = 0
+
+
+# one writer lock per collection directory, shared by every writable backend in the
+# process (flock belongs to the open file, so a second handle would lock us out);
+# the file lock is released when the last of them closes
+_WRITER_LOCKS: Dict[str, _WriterLock] = {}
+_WRITER_LOCKS_LOCK = threading.Lock()
+
+
+def _shared_writer_lock(path: str) -> threading.RLock:
+    key = os.path.realpath(path)
+    with _WRITER_LOCKS_LOCK:
+        entry = _WRITER_LOCKS.get(key)
+        if entry is None:
+            entry = _WriterLock(key)
+            _WRITER_LOCKS[key] = entry
+        entry.users += 1
+        return entry.lock
+
+
+def _release_writer_lock(path: str) -> None:
+    key = os.path.realpath(path)
+    with _WRITER_LOCKS_LOCK:
+        entry = _WRITER_LOCKS.get(key)
+        if entry is None:
+            return
+        entry.users -= 1
+        if entry.users <= 0:
+            entry.handle.close()
+            del _WRITER_LOCKS[key]
+
+
+# a manifest together with the segments it lists, swapped in as one object
+_View = Tuple[Dict[str, Any], Dict[str, _MmapSegment]]
+
+
+class NumpyMmapBackend(VectorBackend):
+    """
+    Exact cosine search over memory-mapped matrices of normalized vectors.
+
+    The collection is a list of immutable segments named by a versioned
+    manifest.json. A single writer process (guarded by writer.lock) appends one
+    segment per upsert and publishes it by atomically replacing the
+    manifest. Readers (read_only=True) never lock: they memory-map the
+    segments, so the OS page cache is shared across processes, and pick
+    up newly published segments on their next search. The writer keeps
+    the lock from its first write until close().
+
+    Every search is one vectorized matmul plus argpartition per segment
+    over its (bitmap-filtered) rows; payloads stay on disk until a hit needs them.
+    """
+
+    name = "numpy"
+
+    def __init__(
+        self,
+        collection_name: str = COLLECTION_NAME,
+        root: str = NUMPY_STORE_PATH,
+        dtype: str = NUMPY_STORE_DTYPE,
+        filter_fields: Optional[List[str]] = None,
+        read_only: bool = False,
+    ):
+        self.collection_name = collection_name
+        self.path = os.path.join(root, collection_name)
+        self.manifest_path = os.path.join(self.path, "manifest.json")
+        self.dtype = np.dtype(dtype)
+        self.filter_fields = list(filter_fields if filter_fields is not None else FILTER_FIELDS)
+        self.read_only = read_only
+        self.vector_size: Optional[int] = None
+
+        self.writer_lock_path = os.path.join(self.path, "writer.lock")
+        self._writer_lock: Optional[threading.RLock] = None
+        self._view: Optional[_View] = None
+        self._view_stat: Optional[Tuple[int, int, int]] = None
+
+    def _refresh(self, strict: bool = False) -> Optional[_View]:
+        """
+        Re-read the manifest if it was replaced since the last call and
+        map any segments not opened yet (all of them if the generation changed).
+        Returns a (manifest, segments) snapshot, or None if there is no store.
+        Callers use only the snapshot, so a concurrent refresh can't change it under them.
+
+        Readers keep serving the previous view when the new one can't be
+        opened; with strict=True (writers) that raises instead, so a manifest
+        that exists but can't be read is never mistaken for a missing store.
+        """
+        try:
+            st = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            self._view, self._view_stat = None, None
+            return None
+
+        view = self._view
+        stat_key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if stat_key == self._view_stat:
+            return view
+
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            # a deleted and recreated collection gets a new generation; nothing mapped before carries over
+            same_generation = view is not None and view[0].get("generation") == manifest.get("generation")
+            cached = view[1] if same_generation else {}
+            segments = {
+                name: cached.get(name) or _MmapSegment(os.path.join(self.path, "segments", name))
+                for name in manifest["segments"]
+            }
+        except (OSError, ValueError, KeyError) as e:
+            if strict:
+                raise RuntimeError(f"Collection {self.collection_name} exists but cannot be opened: {e}") from e
+            # the writer may be deleting the store; keep serving the previous view
+            logger.warning(f"Could not refresh {self.manifest_path}: {e}")
+            return view
+
+        if view is not None and not same_generation:
+            logger.info(f"Collection {self.collection_name} was recreated")
+        elif view is not None and manifest["version"] != view[0]["version"]:
+            logger.info(f"Collection {self.collection_name} moved to version {manifest['version']}")
+        new_view = (manifest, segments)
+        self._view, self._view_stat = new_view, stat_key
+        return new_view
+
+    def _publish(self, manifest: Dict[str, Any]) -> None:
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+        _fsync_dir(self.path)
+        self._view_stat = None
+
+    def _latest(self) -> Optional[Dict[str, Any]]:
+        """Re-read the manifest unconditionally; writers use it before building on the current version."""
+        self._view_stat = None
+        view = self._refresh(strict=True)
+        return view[0] if view is not None else None
+
+    def _acquire_writer(self) -> threading.RLock:
+        """Take the collection's writer lock; hold the returned lock around every write."""
+        if self.read_only:
+            raise PermissionError(f"Collection {self.collection_name} is opened read-only")
+        if self._writer_lock is None:
+            os.makedirs(self.path, exist_ok=True)
+            lock = _shared_writer_lock(self.writer_lock_path)
+            self._writer_lock = lock
+            with lock:
+                self._remove_unpublished_segments()
+        return self._writer_lock
+
+    def _remove_unpublished_segments(self) -> None:
+        """Drop segments a crashed writer built or renamed into place but never published."""
+        try:
+            manifest = self._latest()
+        except RuntimeError as e:
+            # better to keep everything than to guess; writes will keep failing until repaired or deleted
+            logger.error(f"Not cleaning up segments: {e}")
+            return
+        segments_dir = os.path.join(self.path, "segments")
+        if not os.path.isdir(segments_dir):
+            return
+
+        published = set(manifest["segments"]) if manifest else set()
+        for name in os.listdir(segments_dir):
+            if name not in published:
+                logger.warning(f"Removing unpublished segment {name} from {self.collection_name}")
+                shutil.rmtree(os.path.join(segments_dir, name), ignore_errors=True)
+
+    def ensure_collection(self, vector_size: int) -> None:
+        view = self._refresh()
+        manifest = view[0] if view is not None else None
+        if manifest is not None:
+            if manifest["dim"] != vector_size:
+                raise ValueError(
+                    f"Collection {self.collection_name} has vector_size={manifest['dim']}, got {vector_size}"
+                )
+        elif not self.read_only:
+            with self._acquire_writer():
+                # another writer in this process may have created it meanwhile
+                if self._latest() is None:
+                    logger.info(f"Creating collection {self.collection_name} with vector_size={vector_size}")
+                    os.makedirs(os.path.join(self.path, "segments"), exist_ok=True)
+                    self._publish(
+                        {"generation": uuid.uuid4().hex, "version": 0, "dim": vector_size, "segments": []}
+                    )
+        self.vector_size = vector_size
+
+    def upsert(self, vectors: List[List[float]], payloads: List[Dict[str, Any]]) -> int:
+        if len(vectors) == 0:
+            return 0
+        new_vectors = _normalize(np.asarray(vectors, dtype=np.float32)).astype(self.dtype)
+
+        with self._acquire_writer():
+            manifest = self._latest()
+            if manifest is None:
+                self.ensure_collection(new_vectors.shape[1])
+                manifest = self._latest()
+            # a wrong-width segment would break every search once published
+            if new_vectors.shape[1] != manifest["dim"]:
+                raise ValueError(
+                    f"Collection {self.collection_name} has vector_size={manifest['dim']}, "
+                    f"got {new_vectors.shape[1]}"
+                )
+
+            version = manifest["version"] + 1
+            # unique across delete/recreate and crashed writes, so a name never points at two segments
+            name = f"seg_{version:06d}_{uuid.uuid4().hex}"
+            segments_dir = os.path.join(self.path, "segments")
+            tmp_path = os.path.join(segments_dir, f".{name}.tmp")
+
+            # build off to the side, then rename: readers only ever see complete segments
+            try:
+                _write_segment(tmp_path, new_vectors, payloads, self.filter_fields)
+                os.replace(tmp_path, os.path.join(segments_dir, name))
+            except BaseException:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                raise
+            _fsync_dir(segments_dir)
+
+            self._publish({**manifest, "version": version, "segments": manifest["segments"] + [name]})
+        return len(payloads)
+
+    def search(
+        self,
+        query_vector: List[float],
+        k: int,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchHit]:
+        view = self._refresh()
+        if view is None:
+            return []
+        manifest, segments = view
+
+        query = _normalize(np.asarray(query_vector, dtype=np.float32))
+        candidates: List[Tuple[float, _MmapSegment, int]] = []
+        for name in manifest["segments"]:
+            segment = segments[name]
+            rows = segment.filter_rows(filters)
+            if rows is not None and rows.size == 0:
+                continue
+            scores = segment.scores(query, rows)
+            top = _top_k(scores, k)
+            hit_rows = top if rows is None else rows[top]
+            candidates.extend((float(scores[t]), segment, int(r)) for t, r in zip(top, hit_rows))
+
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        return [(score, segment.payload(row)) for score, segment, row in candidates[:k]]
+
+    def stats(self) -> Dict[str, Any]:
+        view = self._refresh()
+        if view is None:
+            return {"exists": False, "backend": self.name, "error": f"No store at {self.path}"}
+        manifest, segments = view
+        return {
+            "exists": True,
+            "backend": self.name,
+            "points_count": sum(segment.count for segment in segments.values()),
+            "vector_size": manifest["dim"],
+            "distance": Distance.COSINE.value,
+            "version": manifest["version"],
+            "segments": len(manifest["segments"]),
+            "read_only": self.read_only,
+        }
+
+    def delete(self) -> bool:
+        try:
+            with self._acquire_writer():
+                # drop the manifest first so readers stop picking up segments that are about to go
+                if os.path.exists(self.manifest_path):
+                    os.remove(self.manifest_path)
+                shutil.rmtree(os.path.join(self.path, "segments"), ignore_errors=True)
+                self._view, self._view_stat = None, None
+            logger.info(f"Collection {self.collection_name} deleted.")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting collection: {str(e)}")
+            return False
+
+    def close(self) -> None:
+        """Give up the writer lock so another process can ingest; a later write takes it again."""
+        lock = self._writer_lock
+        if lock is None:
+            return
+        with lock:
+            self._writer_lock = None
+            _release_writer_lock(self.writer_lock_path)
+
+
+BACKENDS = {
+    QdrantLocalBackend.name: QdrantLocalBackend,
+    QdrantServerBackend.name: QdrantServerBackend,
+    NumpyMmapBackend.name: NumpyMmapBackend,
+}
+
+
+def create_backend(
+    name: Optional[str] = None,
+    collection_name: str = COLLECTION_NAME,
+    read_only: bool = False,
+) -> VectorBackend:
+    """
+    Build a backend by name ("qdrant_local", "qdrant_server" or "numpy"), defaulting to VECTOR_BACKEND.
+    Query-only processes pass read_only=True so they never contend with the ingestion writer.
+    """
+    name = name or VECTOR_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown vector backend '{name}'. Available: {', '.join(BACKENDS)}")
+    return BACKENDS[name](collection_name=collection_name, read_only=read_only)
@@ -1,12 +1,8 @@
 # src/vector_store.py
-import uuid
 import logging
 from typing import List, Dict, Any, Optional
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
-
-from src.config import VECTOR_DB_PATH, COLLECTION_NAME
+from src.vector_backends import VectorBackend, create_backend
 from langchain_core.documents import Document
 
 logger = logging.getLogger(__name__)
@@ -15,17 +11,19 @@ logging.basicConfig(level=logging.INFO)
 
 class VectorStore:
     """
-    A simple wrapper around Qdrant to manage vector embeddings and documents.
+    A simple wrapper around a vector backend to manage vector embeddings and documents.
     Single responsibility: handle vector DB operations (insert, search, stats).
     """
 
-    def __init__(self, embedding_model):
+    def __init__(self, embedding_model, backend: Optional[VectorBackend] = None, read_only: bool = False):
         """
         Args:
             embedding_model: An embedding model object with .embed(list[str]) method.
+            backend: Storage/search backend. Defaults to the one named by VECTOR_BACKEND in config.
+            read_only: Open the default backend for querying only (no writer lock).
         """
-        self.client = QdrantClient(path=VECTOR_DB_PATH)
-        self.collection_name = COLLECTION_NAME
+        self.backend = backend or create_backend(read_only=read_only)
+        self.collection_name = self.backend.collection_name
         self.embedding_model = embedding_model
         self.vector_size: Optional[int] = None
 
@@ -33,15 +31,7 @@ class VectorStore:
         """
         Ensure the collection exists, or create it if it does not.
         """
-        try:
-            self.client.get_collection(self.collection_name)
-            logger.info(f"Collection {self.collection_name} already exists.")
-        except Exception:
-            logger.info(f"Creating collection {self.collection_name} with vector_size={vector_size}")
-            self.client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
-            )
+        self.backend.ensure_collection(vector_size)
 
     def add_documents(self, docs: List[Document]) -> bool:
         """
@@ -65,21 +55,16 @@ class VectorStore:
             self.vector_size = len(embeddings[0])
             self.ensure_or_create_collection(self.vector_size)
 
-        points = []
-        for doc, emb in zip(docs, embeddings):
-            payload = {
+        payloads = [
+            {
                 "text": doc.page_content,
-                **doc.metadata,  
+                **doc.metadata,
             }
-            point = PointStruct(
-                id=str(uuid.uuid4()), 
-                vector=emb,
-                payload=payload,
-            )
-            points.append(point)
+            for doc in docs
+        ]
 
-        self.client.upsert(collection_name=self.collection_name, points=points)
-        logger.info(f"Inserted {len(points)} documents into {self.collection_name}")
+        inserted = self.backend.upsert(embeddings, payloads)
+        logger.info(f"Inserted {inserted} documents into {self.collection_name}")
         return True
 
     def similarity_search(
@@ -103,29 +88,20 @@ class VectorStore:
         """
         query_emb = list(self.embedding_model.embed([query]))[0]
 
-        must_filters = []
+        filters = {}
         if region:
-            must_filters.append({"key": "region", "match": {"value": region}})
+            filters["region"] = region
         if comuna:
-            must_filters.append({"key": "comuna", "match": {"value": comuna}})
+            filters["comuna"] = comuna
 
-        query_filter = {"must": must_filters} if must_filters else None
-
-        result = self.client.search(
-            collection_name=self.collection_name,
-            query_vector=query_emb,
-            limit=k,
-            query_filter=query_filter,
-            with_payload=True,
-            with_vectors=False,
-        )
+        hits = self.backend.search(query_emb, k=k, filters=filters or None)
 
         docs = []
-        for hit in result:
+        for score, payload in hits:
             docs.append(
                 {
-                    "page_content": hit.payload.get("text", ""),
-                    "metadata": {**hit.payload, "score": hit.score},
+                    "page_content": payload.get("text", ""),
+                    "metadata": {**payload, "score": score},
                 }
             )
 
@@ -136,25 +112,16 @@ class VectorStore:
         """
         Return basic statistics about the collection.
         """
-        try:
-            info = self.client.get_collection(self.collection_name)
-            return {
-                "exists": True,
-                "points_count": info.points_count,
-                "vector_size": info.config.params.vectors.size,
-                "distance": info.config.params.vectors.distance.value,
-            }
-        except Exception as e:
-            return {"exists": False, "error": str(e)}
+        return self.backend.stats()
 
     def delete_collection(self) -> bool:
         """
         Completely delete the collection.
         """
-        try:
-            self.client.delete_collection(self.collection_name)
-            logger.info(f"Collection {self.collection_name} deleted.")
-            return True
-        except Exception as e:
-            logger.error(f"Error deleting collection: {str(e)}")
-            return False
+        return self.backend.delete()
+
+    def close(self) -> None:
+        """
+        Release the backend's locks (e.g. the numpy writer lock) so other processes can write.
+        """
+        self.backend.close()